@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import subprocess
+import time
+
+from tools.labctl import doctor
+
+
+def _fake_run(delays: dict[str, float]):
+    def run(cmd: list[str]) -> subprocess.CompletedProcess[str]:
+        time.sleep(delays.get(cmd[0], 0.0))
+        return subprocess.CompletedProcess(cmd, 0, stdout=f"{cmd[0]} v1\n", stderr="")
+
+    return run
+
+
+def test_run_doctor_keeps_declared_order(monkeypatch) -> None:
+    monkeypatch.setattr(doctor, "_which", lambda cmd: f"/usr/bin/{cmd}")
+    monkeypatch.setattr(doctor, "_run", _fake_run({"git": 0.2, "python3": 0.1}))
+
+    results = doctor.run_doctor()
+
+    assert [r.name for r in results] == [
+        "git",
+        "python3",
+        "docker",
+        "kubectl",
+        "kind",
+        "kubectl kustomize",
+    ]
+    assert results[0].message == "/usr/bin/git | git v1"
+
+
+def test_check_command_omits_missing_version(monkeypatch) -> None:
+    monkeypatch.setattr(doctor, "_which", lambda cmd: f"/usr/bin/{cmd}")
+    monkeypatch.setattr(
+        doctor,
+        "_run",
+        lambda cmd: subprocess.CompletedProcess(cmd, 0, stdout="", stderr=""),
+    )
+
+    result = doctor._check_command("kind", ("version",))
+
+    assert result.status == doctor.Status.OK
+    assert result.message == "/usr/bin/kind"
+
+
+def test_check_docker_reports_server_version(monkeypatch) -> None:
+    monkeypatch.setattr(doctor, "_which", lambda cmd: f"/usr/bin/{cmd}")
+    calls: list[list[str]] = []
+
+    def run(cmd: list[str]) -> subprocess.CompletedProcess[str]:
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="27.1.1\n", stderr="")
+
+    monkeypatch.setattr(doctor, "_run", run)
+
+    result = doctor._check_docker()
+
+    assert calls == [["docker", "info", "--format", "{{.ServerVersion}}"]]
+    assert result.name == "docker"
+    assert result.status == doctor.Status.OK
+    assert result.message == "/usr/bin/docker | daemon reachable, server 27.1.1"
+
+
+def test_check_docker_reports_daemon_error(monkeypatch) -> None:
+    monkeypatch.setattr(doctor, "_which", lambda cmd: f"/usr/bin/{cmd}")
+    calls: list[list[str]] = []
+
+    def run(cmd: list[str]) -> subprocess.CompletedProcess[str]:
+        calls.append(cmd)
+        return subprocess.CompletedProcess(
+            cmd, 1, stdout="", stderr="Cannot connect to the Docker daemon\n"
+        )
+
+    monkeypatch.setattr(doctor, "_run", run)
+
+    result = doctor._check_docker()
+
+    assert len(calls) == 1
+    assert result.status == doctor.Status.ERR
+    assert result.message == "/usr/bin/docker | daemon: Cannot connect to the Docker daemon"
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from tools.labctl.kind_config import Topology, get_topology
+
+
+def test_missing_nodes_defaults_to_one_control_plane(tmp_path: Path) -> None:
+    path = tmp_path / "cluster.yaml"
+    path.write_text("kind: Cluster\napiVersion: kind.x-k8s.io/v1alpha4\n")
+
+    assert get_topology(path) == Topology(total=1, control_planes=1, workers=0)
+
+
+def test_missing_role_defaults_to_control_plane(tmp_path: Path) -> None:
+    path = tmp_path / "cluster.yaml"
+    path.write_text("kind: Cluster\nnodes:\n  - {}\n  - role: worker\n  - role: worker\n")
+
+    assert get_topology(path) == Topology(total=3, control_planes=1, workers=2)
+
+
+def test_edited_file_is_parsed_again(tmp_path: Path) -> None:
+    path = tmp_path / "cluster.yaml"
+    path.write_text("nodes:\n  - role: control-plane\n")
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    assert get_topology(path).total == 1
+
+    path.write_text("nodes:\n  - role: control-plane\n  - role: worker\n")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert get_topology(path) == Topology(total=2, control_planes=1, workers=1)
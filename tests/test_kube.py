@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from tools.labctl import kube
+
+
+@pytest.fixture
+def shm(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(kube, "_SHM_DIR", tmp_path)
+    return tmp_path / f"labctl-kube-cache-{os.getuid()}"
+
+
+def test_private_cache_dir_is_created_owner_only(shm: Path) -> None:
+    assert kube._private_cache_dir() == str(shm)
+    assert stat.S_IMODE(shm.lstat().st_mode) & 0o077 == 0
+
+
+def test_private_cache_dir_rejects_symlink(shm: Path, tmp_path: Path) -> None:
+    target = tmp_path / "elsewhere"
+    target.mkdir(mode=0o700)
+    shm.symlink_to(target)
+
+    assert kube._private_cache_dir() is None
+
+
+def test_private_cache_dir_rejects_group_or_other_writable(shm: Path) -> None:
+    shm.mkdir()
+    shm.chmod(0o777)
+
+    assert kube._private_cache_dir() is None
+
+
+def test_private_cache_dir_rejects_other_owner(
+        monkeypatch: pytest.MonkeyPatch,
+        shm: Path,
+        ) -> None:
+    other_uid = os.getuid() + 1
+    monkeypatch.setattr(kube.os, "getuid", lambda: other_uid)
+
+    assert kube._private_cache_dir() is None
+
+
+def test_kubectl_env_keeps_explicit_cache_dir(
+        monkeypatch: pytest.MonkeyPatch,
+        shm: Path,
+        ) -> None:
+    monkeypatch.setenv("KUBECACHEDIR", "/srv/cache")
+
+    assert kube.kubectl_env()["KUBECACHEDIR"] == "/srv/cache"
+    assert not shm.exists()
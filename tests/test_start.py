@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import pytest
+
+from tools.labctl import start
+from tools.labctl.config import LabConfig
+from tools.labctl.kind_config import Topology
+from tools.labctl.kube import CommandResult
+from tools.labctl.start import StartError, StartService
+from tools.labctl.wait import WaitError, WaitSpec
+
+
+class _FakeResponse:
+    status = 200
+
+    def read(self) -> bytes:
+        return b""
+
+
+class _FakeConnection:
+    instances: list[_FakeConnection] = []
+
+    def __init__(self, host: str, port: int, timeout: float) -> None:
+        self.closed = False
+        self.fail = not _FakeConnection.instances
+        _FakeConnection.instances.append(self)
+
+    def request(self, method: str, url: str, headers: dict[str, str]) -> None:
+        if self.fail:
+            raise ConnectionResetError("reset by peer")
+
+    def getresponse(self) -> _FakeResponse:
+        return _FakeResponse()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def isolated_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(start, "kubectl_env", lambda: {"PATH": "/usr/bin"})
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> StartService:
+    monkeypatch.setattr(
+        start, "get_topology", lambda path: Topology(total=2, control_planes=1, workers=1)
+    )
+    return StartService(LabConfig(cluster_name="test"))
+
+
+def test_node_watch_waits_for_every_expected_node(service: StartService) -> None:
+    on_event = service._node_watch_handler()
+
+    assert on_event("n1\tFalse") == (False, "Nodes Ready: 0/2")
+    assert on_event("n1\tTrue") == (False, "Nodes Ready: 1/2")
+    assert on_event("n2\tUnknown") == (False, "Nodes Ready: 1/2")
+    assert on_event("n2\tTrue") == (True, "Nodes Ready: 2/2")
+
+
+def _fake_kubectl(
+        monkeypatch: pytest.MonkeyPatch,
+        nodes: str,
+        ) -> list[list[str]]:
+    commands: list[list[str]] = []
+
+    def run_or_raise(
+            command: Sequence[str],
+            env: Mapping[str, str] | None = None,
+        ) -> CommandResult:
+        commands.append(list(command))
+        stdout = nodes if command[1:3] == ["get", "nodes"] else ""
+        return CommandResult(returncode=0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(start, "run_or_raise", run_or_raise)
+    return commands
+
+
+def test_snapshot_bails_out_before_reading_topology(monkeypatch: pytest.MonkeyPatch) -> None:
+    def get_topology(path: object) -> Topology:
+        raise AssertionError("topology should not be read")
+
+    monkeypatch.setattr(start, "get_topology", get_topology)
+    _fake_kubectl(monkeypatch, "n1\tFalse\nn2\tTrue\n")
+
+    assert not StartService(LabConfig(cluster_name="test"))._cluster_is_healthy_snapshot()
+
+
+def test_snapshot_requires_the_expected_node_count(
+        monkeypatch: pytest.MonkeyPatch,
+        service: StartService,
+        ) -> None:
+    _fake_kubectl(monkeypatch, "n1\tTrue\n")
+    assert not service._cluster_is_healthy_snapshot()
+
+    commands = _fake_kubectl(monkeypatch, "n1\tTrue\nn2\tTrue\n")
+    assert service._cluster_is_healthy_snapshot()
+    assert len(commands) == 1
+    assert "--request-timeout=3s" in commands[0]
+
+
+def test_smoke_rebuilds_connection_after_error(
+        monkeypatch: pytest.MonkeyPatch,
+        service: StartService,
+        ) -> None:
+    monkeypatch.setattr(_FakeConnection, "instances", [])
+    monkeypatch.setattr(start.http.client, "HTTPConnection", _FakeConnection)
+
+    assert service._check_ingress_smoke_200() == (False, "Ingress HTTP: no response yet")
+    assert _FakeConnection.instances[0].closed
+    assert service._smoke_conn is None
+
+    assert service._check_ingress_smoke_200() == (True, "Ingress HTTP: 200 OK")
+    assert len(_FakeConnection.instances) == 2
+    assert service._smoke_conn is _FakeConnection.instances[1]
+
+
+def test_pod_watch_raises_with_fetched_message_on_fatal_reason(
+        monkeypatch: pytest.MonkeyPatch,
+        service: StartService,
+        ) -> None:
+    monkeypatch.setattr(
+        start,
+        "run_command",
+        lambda command, env=None: CommandResult(returncode=0, stdout="back-off 10s", stderr=""),
+    )
+    on_event = service._pod_watch_handler("ingress-nginx", "ingress", require_all=True)
+
+    assert on_event("p1\t\tFalse\tContainerCreating") == (False, "ingress Pods Ready: 0/1")
+    with pytest.raises(WaitError, match="p2 reason=CrashLoopBackOff back-off 10s"):
+        on_event("p2\t\tFalse\t\tCrashLoopBackOff")
+
+
+def test_pod_watch_forgets_deleted_pods(service: StartService) -> None:
+    on_event = service._pod_watch_handler("ingress-nginx", "ingress", require_all=True)
+
+    assert on_event("old\t\tFalse") == (False, "ingress Pods Ready: 0/1")
+    assert on_event("new\t\tTrue") == (False, "ingress Pods Ready: 1/2")
+    assert on_event("old\t2024-01-01T00:00:00Z\tFalse") == (True, "ingress Pods Ready: 1/1")
+
+
+def test_pod_watch_require_all_vs_any_ready(service: StartService) -> None:
+    all_ready = service._pod_watch_handler("ns", "x", require_all=True)
+    any_ready = service._pod_watch_handler("ns", "x", require_all=False)
+
+    for line in ("a\t\tTrue", "b\t\tFalse"):
+        all_done, _ = all_ready(line)
+        any_done, _ = any_ready(line)
+
+    assert not all_done
+    assert any_done
+    assert all_ready("") == (False, "x Pods Ready: 1/2")
+
+
+def test_pod_failure_fetches_message_for_the_fatal_reason(
+        monkeypatch: pytest.MonkeyPatch,
+        service: StartService,
+        ) -> None:
+    commands: list[list[str]] = []
+
+    def run_command(
+            command: Sequence[str],
+            env: Mapping[str, str] | None = None,
+        ) -> CommandResult:
+        assert env == {"PATH": "/usr/bin"}
+        commands.append(list(command))
+        return CommandResult(returncode=0, stdout="back-off 10s\nrestarting failed", stderr="")
+
+    monkeypatch.setattr(start, "run_command", run_command)
+
+    err = service._pod_failure("ingress-nginx", "p2", "CrashLoopBackOff", "ingress")
+
+    assert err == "ingress pod failure: p2 reason=CrashLoopBackOff back-off 10s restarting failed"
+    assert commands[0][:6] == ["kubectl", "-n", "ingress-nginx", "get", "pod", "p2"]
+    assert '@.state.waiting.reason=="CrashLoopBackOff"' in commands[0][-1]
+
+
+def test_stuck_stage_times_out_as_start_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    svc = StartService(
+        LabConfig(cluster_name="test"),
+        WaitSpec(poll_seconds=0.01, watch_timeout_seconds=0.05),
+    )
+    monkeypatch.setattr(svc, "_ensure_cluster", lambda: True)
+    monkeypatch.setattr(
+        svc,
+        "_bring_up_platform",
+        lambda nodes_ready: svc.waiter.wait("Ingress 200 OK", lambda: (False, "no response")),
+    )
+
+    with pytest.raises(StartError, match="Timed out waiting for: Ingress 200 OK"):
+        svc.execute()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from tools.labctl import wait
+from tools.labctl.wait import Waiter, WaitError, WaitSpec, WatchWaiter
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(wait.random, "uniform", lambda a, b: 0.0)
+
+
+def test_backoff_doubles_up_to_poll_seconds() -> None:
+    waiter = Waiter(WaitSpec(poll_seconds=1.0, initial_poll_seconds=0.1))
+
+    assert [waiter._backoff(n) for n in range(5)] == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0])
+    assert waiter._backoff(1000) == 1.0
+
+
+def test_backoff_resets_when_status_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    sleeps: list[float] = []
+    monkeypatch.setattr(wait.time, "sleep", sleeps.append)
+    results = iter([(False, "a")] * 3 + [(False, "b")] * 2 + [(True, "")])
+
+    Waiter(WaitSpec(poll_seconds=1.0, initial_poll_seconds=0.1)).wait("t", lambda: next(results))
+
+    assert sleeps == pytest.approx([0.1, 0.2, 0.4, 0.1, 0.2])
+
+
+def test_wait_times_out_at_the_watch_deadline() -> None:
+    waiter = Waiter(WaitSpec(poll_seconds=0.05, watch_timeout_seconds=0.2))
+
+    with pytest.raises(WaitError, match=r"Timed out waiting for: Ingress \(Ingress HTTP: 503\)"):
+        waiter.wait("Ingress", lambda: (False, "Ingress HTTP: 503"))
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_watch_joins_lines_split_across_reads() -> None:
+    lines: list[str] = []
+
+    def on_event(line: str) -> tuple[bool, str]:
+        lines.append(line)
+        return line == "done", line
+
+    command = _python(
+        "import sys, time\n"
+        "sys.stdout.write('n1\\tTr'); sys.stdout.flush(); time.sleep(0.2)\n"
+        "sys.stdout.write('ue\\ndone\\n'); sys.stdout.flush(); time.sleep(5)\n"
+    )
+    WatchWaiter(WaitSpec(poll_seconds=0.05)).watch("t", command, on_event)
+
+    assert lines == ["n1\tTrue", "done"]
+
+
+def test_watch_restarts_command_on_eof(tmp_path: Path) -> None:
+    runs = tmp_path / "runs"
+    command = _python(
+        "import pathlib, sys\n"
+        f"p = pathlib.Path({str(runs)!r})\n"
+        "n = int(p.read_text()) + 1 if p.exists() else 1\n"
+        "p.write_text(str(n))\n"
+        "print('run', n)\n"
+    )
+
+    WatchWaiter(WaitSpec(poll_seconds=0.05)).watch(
+        "t", command, lambda line: (line == "run 3", line)
+    )
+
+    assert runs.read_text() == "3"
+
+
+def test_watch_timeout_reports_last_kubectl_error() -> None:
+    command = _python(
+        "import sys\n"
+        "sys.stderr.write('warning: retrying\\n')\n"
+        "sys.stderr.write('error: the server could not find the requested resource\\n')\n"
+    )
+    waiter = WatchWaiter(WaitSpec(poll_seconds=0.05, watch_timeout_seconds=0.5))
+
+    with pytest.raises(WaitError) as excinfo:
+        waiter.watch("Nodes", command, lambda line: (False, line))
+
+    assert str(excinfo.value) == (
+        "Timed out waiting for: Nodes "
+        "(kubectl: error: the server could not find the requested resource)"
+    )
+
+
+def test_watch_draws_rate_limited_update_once_interval_passes(
+        capsys: pytest.CaptureFixture[str],
+        ) -> None:
+    command = _python(
+        "import sys, time\n"
+        "print('0/2'); print('1/2'); sys.stdout.flush(); time.sleep(0.6)\n"
+        "print('2/2'); sys.stdout.flush(); time.sleep(5)\n"
+    )
+    waiter = WatchWaiter(WaitSpec(poll_seconds=0.05, status_interval=0.2))
+
+    waiter.watch("Nodes", command, lambda line: (line == "2/2", line))
+
+    out = capsys.readouterr().out
+    assert "     0/2\r" in out
+    assert "     1/2\r" in out
+    assert "2/2 (OK)" in out
+
+
+def test_status_redraws_only_on_change_and_covers_longer_lines(
+        capsys: pytest.CaptureFixture[str],
+        ) -> None:
+    waiter = Waiter(WaitSpec(status_interval=0.0))
+
+    waiter._status("Pods Ready: 10/12")
+    waiter._status("Pods Ready: 10/12")
+    waiter._status("no pods")
+    waiter._finish("ok")
+
+    out = capsys.readouterr().out
+    assert out.count("Pods Ready: 10/12") == 1
+    assert "     no pods" + " " * 10 + "\r" in out
+    assert out.endswith("     ok (OK)" + " " * 10 + "\n")
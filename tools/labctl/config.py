@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 from pathlib import Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LabConfig:
     cluster_name: str
 
 
+@functools.lru_cache(maxsize=1)
 def repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
@@ -17,5 +19,6 @@ def lab_config() -> LabConfig:
     return LabConfig(cluster_name="kube-chaos-lab")
 
 
+@functools.lru_cache(maxsize=1)
 def kind_cluster_config_path() -> Path:
     return repo_root() / "infra" / "kind" / "cluster.yaml"
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import functools
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Iterable
+from typing import Callable, Iterable, Sequence
 
 
 class Status(str, Enum):
@@ -13,17 +15,21 @@ class Status(str, Enum):
     ERR = "ERR"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CheckResult:
     name: str
     status: Status
     message: str
 
 
+_VERSION_UNAVAILABLE = "version output not available"
+
+
 def _run(cmd: list[str]) -> subprocess.CompletedProcess[str]:
     return subprocess.run(cmd, check=False, text=True, capture_output=True)
 
 
+@functools.lru_cache(maxsize=None)
 def _which(cmd: str) -> str | None:
     return shutil.which(cmd)
 
@@ -36,14 +42,14 @@ def _first_line(text: str) -> str:
     return ""
 
 
-def _cmd_version(cmd: str, args: list[str]) -> str:
+def _cmd_version(cmd: str, args: Sequence[str]) -> str:
     proc = _run([cmd, *args])
     out = (proc.stdout or "") + ("\n" + proc.stderr if proc.stderr else "")
     line = _first_line(out)
-    return line if line else "version output not available"
+    return line if line else _VERSION_UNAVAILABLE
 
 
-def _check_command(cmd: str, version_args: list[str] | None = None) -> CheckResult:
+def _check_command(cmd: str, version_args: Sequence[str] | None = None) -> CheckResult:
     path = _which(cmd)
     if not path:
         return CheckResult(name=cmd, status=Status.ERR, message="not found")
@@ -52,22 +58,31 @@ def _check_command(cmd: str, version_args: list[str] | None = None) -> CheckResu
         return CheckResult(name=cmd, status=Status.OK, message=path)
 
     ver = _cmd_version(cmd, version_args)
+    if ver == _VERSION_UNAVAILABLE:
+        return CheckResult(name=cmd, status=Status.OK, message=path)
     return CheckResult(name=cmd, status=Status.OK, message=f"{path} | {ver}")
 
 
-def _check_docker_daemon() -> CheckResult:
-    if not _which("docker"):
-        return CheckResult(name="docker daemon", status=Status.ERR, message="docker not installed")
+def _check_docker() -> CheckResult:
+    path = _which("docker")
+    if not path:
+        return CheckResult(name="docker", status=Status.ERR, message="not found")
 
-    proc = _run(["docker", "info"])
+    proc = _run(["docker", "info", "--format", "{{.ServerVersion}}"])
     if proc.returncode == 0:
-        return CheckResult(name="docker daemon", status=Status.OK, message="reachable")
+        ver = _first_line(proc.stdout) or "unknown"
+        return CheckResult(
+            name="docker",
+            status=Status.OK,
+            message=f"{path} | daemon reachable, server {ver}",
+        )
+
     msg = (
-        _first_line(proc.stderr) 
-        or _first_line(proc.stdout) 
+        _first_line(proc.stderr)
+        or _first_line(proc.stdout)
         or "not reachable (is Docker running?)"
     )
-    return CheckResult(name="docker daemon", status=Status.ERR, message=msg)
+    return CheckResult(name="docker", status=Status.ERR, message=f"{path} | daemon: {msg}")
 
 
 def _check_kubectl_kustomize() -> CheckResult:
@@ -84,7 +99,7 @@ def _check_kubectl_kustomize() -> CheckResult:
                            message="available")
 
     if _which("kustomize"):
-        ver = _cmd_version("kustomize", ["version"])
+        ver = _cmd_version("kustomize", ("version",))
         return CheckResult(name="kustomize", status=Status.OK, message=ver)
 
     return CheckResult(
@@ -94,17 +109,19 @@ def _check_kubectl_kustomize() -> CheckResult:
     )
 
 
+_CHECKS: tuple[Callable[[], CheckResult], ...] = (
+    functools.partial(_check_command, "git", ("--version",)),
+    functools.partial(_check_command, "python3", ("--version",)),
+    _check_docker,
+    functools.partial(_check_command, "kubectl", ("version", "--client", "--short")),
+    functools.partial(_check_command, "kind", ("version",)),
+    _check_kubectl_kustomize,
+)
+
+
 def run_doctor() -> list[CheckResult]:
-    checks: list[CheckResult] = [
-        _check_command("git", ["--version"]),
-        _check_command("python3", ["--version"]),
-        _check_command("docker", ["--version"]),
-        _check_docker_daemon(),
-        _check_command("kubectl", ["version", "--client", "--short"]),
-        _check_command("kind", ["version"]),
-        _check_kubectl_kustomize(),
-    ]
-    return checks
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(lambda check: check(), _CHECKS))
 
 
 def exit_code(results: Iterable[CheckResult]) -> int:
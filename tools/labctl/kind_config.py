@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import functools
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+class Topology(NamedTuple):
+    total: int
+    control_planes: int
+    workers: int
+
+
+def get_topology(path: str | os.PathLike[str]) -> Topology:
+    st = os.stat(path)
+    return _parse_topology(str(path), st.st_mtime_ns, st.st_size)
+
+
+# mtime/size are part of the key so edits to the file invalidate the entry.
+@functools.lru_cache(maxsize=4)
+def _parse_topology(path: str, mtime_ns: int, size: int) -> Topology:
+    data = yaml.load(Path(path).read_bytes(), Loader=_SafeLoader) or {}
+    # kind defaults to a single control-plane node when "nodes" is omitted.
+    nodes = data.get("nodes") or [{}]
+    roles = [node.get("role", "control-plane") for node in nodes]
+    control_planes = roles.count("control-plane")
+    return Topology(
+        total=len(roles),
+        control_planes=control_planes,
+        workers=len(roles) - control_planes,
+    )
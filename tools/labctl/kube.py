@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import functools
+import os
+import shutil
+import stat
 import subprocess
 from dataclasses import dataclass
-from typing import Sequence
+from pathlib import Path
+from typing import Any, Mapping, Sequence
 
+_SHM_DIR = Path("/dev/shm")
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class CommandResult:
     returncode: int
     stdout: str
@@ -24,12 +31,72 @@ class CommandError(RuntimeError):
         return f"Command failed: {cmd}\n{details}"
 
 
-def run_command(command: Sequence[str]) -> CommandResult:
+@functools.lru_cache(maxsize=None)
+def _resolve_executable(name: str) -> str:
+    return shutil.which(name) or name
+
+
+def _argv(command: Sequence[str]) -> list[str]:
+    # subprocess only takes the posix_spawn fast path for an absolute executable
+    # and close_fds=False; our own fds are non-inheritable (PEP 446) anyway.
+    argv = list(command)
+    argv[0] = _resolve_executable(argv[0])
+    return argv
+
+
+def popen(command: Sequence[str], **kwargs: Any) -> subprocess.Popen[bytes]:
+    return subprocess.Popen(_argv(command), close_fds=False, **kwargs)
+
+
+def terminate(proc: subprocess.Popen[bytes]) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    if proc.stdout is not None:
+        proc.stdout.close()
+
+
+def _private_cache_dir() -> str | None:
+    if not _SHM_DIR.is_dir():
+        return None
+
+    path = _SHM_DIR / f"labctl-kube-cache-{os.getuid()}"
+    try:
+        path.mkdir(mode=0o700, exist_ok=True)
+        st = path.lstat()
+    except OSError:
+        return None
+
+    # /dev/shm is world-writable: only use a real directory we own and nobody else can write.
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return None
+    return str(path)
+
+
+def kubectl_env() -> dict[str, str]:
+    env = dict(os.environ)
+    # Keep kubectl's discovery/http cache in RAM unless the user chose a location.
+    if "KUBECACHEDIR" not in env:
+        cache_dir = _private_cache_dir()
+        if cache_dir is not None:
+            env["KUBECACHEDIR"] = cache_dir
+    return env
+
+
+def run_command(
+        command: Sequence[str],
+        env: Mapping[str, str] | None = None,
+    ) -> CommandResult:
     proc = subprocess.run(
-        list(command),
+        _argv(command),
         check=False,
         text=True,
         capture_output=True,
+        close_fds=False,
+        env=env,
     )
     return CommandResult(
         returncode=proc.returncode,
@@ -38,8 +105,12 @@ def run_command(command: Sequence[str]) -> CommandResult:
     )
 
 
-def run_or_raise(command: Sequence[str]) -> CommandResult:
-    result = run_command(command)
+def run_or_raise(
+        command: Sequence[str],
+        env: Mapping[str, str] | None = None,
+    ) -> CommandResult:
+    result = run_command(command, env=env)
     if result.returncode != 0:
         raise CommandError(command, result)
     return result
+
@@ -1,14 +1,44 @@
 from __future__ import annotations
 
-import json
-import urllib.error
-import urllib.request
-
-import yaml
+import functools
+import http.client
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Sequence
 
 from .config import LabConfig, kind_cluster_config_path, repo_root
-from .kube import CommandError, run_command, run_or_raise
-from .wait import Waiter, WaitSpec
+from .kind_config import get_topology
+from .kube import CommandError, kubectl_env, run_command, run_or_raise
+from .wait import EventFn, WaitError, WaitSpec, WatchWaiter
+
+# "<name>\t<Ready status>" per node; the list form covers `get nodes`, the bare
+# form each object of `get nodes --watch`.
+_NODE_READY_FIELDS = (
+    '{.metadata.name}{"\\t"}{.status.conditions[?(@.type=="Ready")].status}{"\\n"}'
+)
+_NODE_READY_JSONPATH = "{range .items[*]}" + _NODE_READY_FIELDS + "{end}"
+_HEALTH_PROBE_TIMEOUT = "3s"
+
+# "<pod>\t<deletionTimestamp>\t<Ready status>\t<waiting reason>..." per pod
+# event. Waiting messages are free text and may span lines, so they stay out of
+# the stream and are fetched separately on a failure.
+_POD_STATE_JSONPATH = (
+    '{.metadata.name}{"\\t"}{.metadata.deletionTimestamp}{"\\t"}'
+    '{.status.conditions[?(@.type=="Ready")].status}'
+    '{range .status.containerStatuses[*]}{"\\t"}{.state.waiting.reason}{end}{"\\n"}'
+)
+_WAITING_MESSAGE_JSONPATH = (
+    '{{.status.containerStatuses[?(@.state.waiting.reason=="{reason}")].state.waiting.message}}'
+)
+
+_FATAL_WAITING_REASONS = frozenset({"ImagePullBackOff", "ErrImagePull", "CrashLoopBackOff"})
+
+
+def _fatal_reason(reasons: Sequence[str]) -> str | None:
+    for reason in reasons:
+        if reason in _FATAL_WAITING_REASONS:
+            return reason
+    return None
 
 
 class StartError(Exception):
@@ -19,66 +49,98 @@ class StartService:
     def __init__(self, config: LabConfig, wait: WaitSpec | None = None):
         self.config = config
         self.wait = wait or WaitSpec()
-        self.waiter = Waiter(self.wait)
+        # Built once and shared by every kind/kubectl process we start.
+        self.env = kubectl_env()
+        self.waiter = WatchWaiter(self.wait)
+        self._smoke_conn: http.client.HTTPConnection | None = None
 
     def execute(self) -> None:
         print("\n[1/6] Reconciling cluster...")
-        self._ensure_cluster()
+        nodes_ready = self._ensure_cluster()
+
+        try:
+            self._bring_up_platform(nodes_ready)
+        except WaitError as e:
+            raise StartError(str(e)) from e
+        finally:
+            self._close_smoke_conn()
+
+        print("\n✔ Cluster and platform are ready.\n")
 
+    def _bring_up_platform(self, nodes_ready: bool) -> None:
         print("[2/6] Waiting for nodes to become Ready...")
-        self.waiter.wait("Nodes becoming Ready", self._check_nodes_ready)
+        if nodes_ready:
+            print("  → Nodes already verified Ready during reconcile.")
+        else:
+            self.waiter.watch(
+                "Nodes becoming Ready",
+                ["kubectl", "get", "nodes", "--watch", "-o", f"jsonpath={_NODE_READY_FIELDS}"],
+                self._node_watch_handler(),
+                env=self.env,
+            )
 
         print("[3/6] Applying base manifests (kubectl apply -k)...")
         self._apply_base_manifests()
 
+        # CoreDNS and ingress-nginx roll out independently; wait for both at once.
         print("[4/6] Waiting for core system components (CoreDNS)...")
-        self.waiter.wait(
-            "CoreDNS deployment Available",
-            lambda: self._check_deployment_available(
-                namespace="kube-system",
-                deployment="coredns",
-                component_name="CoreDNS",
-            ),
-            fail_fast=lambda: self._fail_fast_pods(
+        print("[5/6] Waiting for ingress platform (ingress-nginx)...")
+        abort = threading.Event()
+        stages = [
+            functools.partial(
+                self._wait_for_pods,
+                "CoreDNS Pods Ready",
                 namespace="kube-system",
                 label_selector="k8s-app=kube-dns",
                 component_name="CoreDNS",
+                require_all=False,
+                abort=abort,
             ),
-        )
-
-        print("[5/6] Waiting for ingress platform (ingress-nginx)...")
-        self.waiter.wait(
-            "Ingress controller Pods Ready",
-            self._check_ingress_controller_pods_ready,
-            fail_fast=lambda: self._fail_fast_pods(
+            functools.partial(
+                self._wait_for_pods,
+                "Ingress controller Pods Ready",
                 namespace="ingress-nginx",
                 label_selector="app.kubernetes.io/component=controller",
                 component_name="ingress-nginx controller",
+                require_all=True,
+                abort=abort,
             ),
-        )
+        ]
+        with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+            futures = [executor.submit(stage) for stage in stages]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                abort.set()
+                raise
 
         print("[6/6] Running ingress entrypoint smoke test (localhost:8080)...")
         self.waiter.wait("Ingress 200 OK (Host: hello.local)", self._check_ingress_smoke_200)
 
-        print("\n✔ Cluster and platform are ready.\n")
-
- 
-    def _ensure_cluster(self) -> None:
-        clusters = run_command(["kind", "get", "clusters"]).stdout.splitlines()
-
-        if self.config.cluster_name not in clusters:
+    def _ensure_cluster(self) -> bool:
+        if not self._cluster_exists():
             print("  → Cluster not found. Creating...")
             self._create_cluster()
             print("  → Cluster created.")
-            return
+            return False
 
         if not self._cluster_is_healthy_snapshot():
             print("  → Existing cluster unhealthy. Recreating...")
             self._delete_cluster()
             self._create_cluster()
             print("  → Cluster recreated.")
-        else:
-            print("  → Existing cluster is healthy. Reusing.")
+            return False
+
+        print("  → Existing cluster is healthy. Reusing.")
+        return True
+
+    def _cluster_exists(self) -> bool:
+        result = run_command(["kind", "get", "clusters"], env=self.env)
+        for line in result.stdout.splitlines():
+            if line.strip() == self.config.cluster_name:
+                return True
+        return False
 
     def _create_cluster(self) -> None:
         try:
@@ -91,45 +153,53 @@ class StartService:
                     self.config.cluster_name,
                     "--config",
                     str(kind_cluster_config_path()),
-                ]
+                ],
+                env=self.env,
             )
         except CommandError as e:
             raise StartError(f"Failed to create cluster: {e}") from e
 
     def _delete_cluster(self) -> None:
         try:
-            run_or_raise(["kind", "delete", "cluster", "--name", self.config.cluster_name])
+            run_or_raise(
+                ["kind", "delete", "cluster", "--name", self.config.cluster_name],
+                env=self.env,
+            )
         except CommandError as e:
             raise StartError(f"Failed to delete cluster: {e}") from e
 
     def _cluster_is_healthy_snapshot(self) -> bool:
+        # A successful node listing already proves the apiserver is reachable.
         try:
-            run_or_raise(["kubectl", "cluster-info"])
+            lines = self._node_ready_lines()
         except CommandError:
             return False
 
-        try:
-            result = run_or_raise(["kubectl", "get", "nodes", "-o", "json"])
-            nodes = json.loads(result.stdout)
-        except Exception:
-            return False
-
-        expected_nodes = self._expected_node_count()
-        items = nodes.get("items", [])
-        if len(items) != expected_nodes:
-            return False
+        count = 0
+        for line in lines:
+            if not line.endswith("\tTrue"):
+                return False
+            count += 1
 
-        return all(self._node_is_ready(n) for n in items)
+        return count == self.expected_node_count
 
-    def _expected_node_count(self) -> int:
-        config_path = kind_cluster_config_path()
-        with open(config_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        return len(data.get("nodes", []))
+    @functools.cached_property
+    def expected_node_count(self) -> int:
+        return get_topology(kind_cluster_config_path()).total
 
-    def _node_is_ready(self, node_obj: dict) -> bool:
-        conditions = node_obj.get("status", {}).get("conditions", [])
-        return any(c.get("type") == "Ready" and c.get("status") == "True" for c in conditions)
+    def _node_ready_lines(self) -> list[str]:
+        result = run_or_raise(
+            [
+                "kubectl",
+                "get",
+                "nodes",
+                f"--request-timeout={_HEALTH_PROBE_TIMEOUT}",
+                "-o",
+                f"jsonpath={_NODE_READY_JSONPATH}",
+            ],
+            env=self.env,
+        )
+        return result.stdout.splitlines()
 
 
     def _apply_base_manifests(self) -> None:
@@ -138,107 +208,118 @@ class StartService:
             raise StartError("infra/base directory not found.")
 
         try:
-            run_or_raise(["kubectl", "apply", "-k", str(base_path)])
+            run_or_raise(["kubectl", "apply", "-k", str(base_path)], env=self.env)
         except CommandError as e:
             raise StartError(f"Failed to apply base manifests: {e}") from e
 
         print("  → Base manifests applied.")
 
-    def _check_nodes_ready(self) -> tuple[bool, str]:
-        expected = self._expected_node_count()
+    def _node_watch_handler(self) -> EventFn:
+        expected = self.expected_node_count
+        ready_by_node: dict[str, bool] = {}
 
-        try:
-            result = run_or_raise(["kubectl", "get", "nodes", "-o", "json"])
-            nodes = json.loads(result.stdout)
-            items = nodes.get("items", [])
-        except Exception:
-            return False, f"Nodes Ready: 0/{expected}"
-
-        ready = sum(1 for n in items if self._node_is_ready(n))
-        done = len(items) == expected and ready == expected
+        def on_event(line: str) -> tuple[bool, str]:
+            name, _, status = line.partition("\t")
+            if name:
+                ready_by_node[name] = status.strip() == "True"
+            ready = sum(ready_by_node.values())
+            done = len(ready_by_node) == expected and ready == expected
+            return done, f"Nodes Ready: {ready}/{expected}"
 
-        return done, f"Nodes Ready: {ready}/{expected}"
+        return on_event
 
-    def _check_deployment_available(
+    def _pod_watch_handler(
             self,
             namespace: str,
-            deployment: str,
-            component_name: str
-            ) -> tuple[bool, str]:
-        try:
-            result = run_or_raise(
-                [
-                    "kubectl",
-                    "-n",
-                    namespace,
-                    "get",
-                    "deployment",
-                    deployment,
-                    "-o",
-                    "json"
-                ]
-            )
-            dep = json.loads(result.stdout)
-        except Exception:
-            return False, f"{component_name}: deployment not found yet"
-
-        desired = dep.get("spec", {}).get("replicas", 1) or 1
-        available = dep.get("status", {}).get("availableReplicas", 0) or 0
-        ready = dep.get("status", {}).get("readyReplicas", 0) or 0
-
-        done = ready >= 1 and available >= 1
-
-        return done, f"{component_name}: desired={desired} ready={ready} available={available}"
+            component_name: str,
+            require_all: bool,
+        ) -> EventFn:
+        ready_by_pod: dict[str, bool] = {}
+
+        def on_event(line: str) -> tuple[bool, str]:
+            name, deleting, ready, *reasons = line.split("\t") + ["", ""]
+            if name:
+                reason = _fatal_reason(reasons)
+                if reason:
+                    raise WaitError(self._pod_failure(namespace, name, reason, component_name))
+                if deleting:
+                    ready_by_pod.pop(name, None)
+                else:
+                    ready_by_pod[name] = ready == "True"
+
+            ready_count = sum(ready_by_pod.values())
+            total = len(ready_by_pod)
+            if require_all:
+                done = total > 0 and ready_count == total
+            else:
+                done = ready_count > 0
+            return done, f"{component_name} Pods Ready: {ready_count}/{total}"
+
+        return on_event
+
+    def _wait_for_pods(
+            self,
+            title: str,
+            namespace: str,
+            label_selector: str,
+            component_name: str,
+            require_all: bool,
+            abort: threading.Event | None = None,
+        ) -> None:
+        def fail_fast() -> str | None:
+            if abort is not None and abort.is_set():
+                return f"{title}: aborted"
+            return None
 
-    def _check_ingress_controller_pods_ready(self) -> tuple[bool, str]:
-        namespace = "ingress-nginx"
-        label_selector = "app.kubernetes.io/component=controller"
+        # Stages run concurrently: each gets its own waiter and prints whole lines.
+        waiter = WatchWaiter(self.wait, inline=False)
+        waiter.watch(
+            title,
+            [
+                "kubectl", "-n", namespace, "get", "pods", "-l", label_selector,
+                "--watch", "-o", f"jsonpath={_POD_STATE_JSONPATH}",
+            ],
+            self._pod_watch_handler(namespace, component_name, require_all),
+            fail_fast=fail_fast,
+            env=self.env,
+        )
 
+    def _pod_failure(
+            self,
+            namespace: str,
+            pod_name: str,
+            reason: str,
+            component_name: str,
+        ) -> str:
         result = run_command(
             [
                 "kubectl",
                 "-n",
-                namespace,                       
+                namespace,
                 "get",
-                "pods",
-                "-l",
-                label_selector,
+                "pod",
+                pod_name,
                 "-o",
-                "json"
-            ]
+                "jsonpath=" + _WAITING_MESSAGE_JSONPATH.format(reason=reason),
+            ],
+            env=self.env,
         )
-        if result.returncode != 0:
-            return False, "Ingress pods not found yet"
-
-        data = json.loads(result.stdout)
-        pods = data.get("items", [])
-        if not pods:
-            return False, "Ingress pods not created yet"
-
-        ready_count = 0
-        total = len(pods)
-
-        for pod in pods:
-            conditions = pod.get("status", {}).get("conditions", [])
-            is_ready = any(
-                c.get("type") == "Ready" and c.get("status") == "True" 
-                for c in conditions
-            )
-            if is_ready:
-                ready_count += 1
-
-        done = ready_count == total
-        return done, f"Ingress Pods Ready: {ready_count}/{total}"
+        message = " ".join(result.stdout.split()) if result.returncode == 0 else ""
+        return f"{component_name} pod failure: {pod_name} reason={reason} {message}".strip()
 
     def _check_ingress_smoke_200(self) -> tuple[bool, str]:
-        url = "http://127.0.0.1:8080/"
         host_header = "hello.local"
 
+        if self._smoke_conn is None:
+            self._smoke_conn = http.client.HTTPConnection("127.0.0.1", 8080, timeout=2)
+
         try:
-            req = urllib.request.Request(url, headers={"Host": host_header}, method="GET")
-            with urllib.request.urlopen(req, timeout=2) as resp:
-                status = resp.status
-        except Exception:
+            self._smoke_conn.request("GET", "/", headers={"Host": host_header})
+            resp = self._smoke_conn.getresponse()
+            status = resp.status
+            resp.read()
+        except (http.client.HTTPException, OSError):
+            self._close_smoke_conn()
             return False, "Ingress HTTP: no response yet"
 
         if status == 200:
@@ -246,50 +327,7 @@ class StartService:
 
         return False, f"Ingress HTTP: {status}"
 
-
-    def _fail_fast_pods(
-            self,
-            namespace: str,
-            label_selector: str,
-            component_name: str
-        ) -> str | None:
-        pods = run_command(
-            [
-                "kubectl",
-                "-n",
-                namespace,
-                "get",
-                "pods",
-                "-l",
-                label_selector,
-                "-o",
-                "json"
-            ]
-        )
-        if pods.returncode != 0:
-            return None
-
-        pod_data = json.loads(pods.stdout)
-        for pod in pod_data.get("items", []):
-            pod_name = pod.get("metadata", {}).get("name", "<unknown>")
-
-            for cs in pod.get("status", {}).get("containerStatuses", []) or []:
-                state = cs.get("state", {}) or {}
-                waiting = state.get("waiting")
-                if not waiting:
-                    continue
-
-                reason = waiting.get("reason")
-                message = waiting.get("message", "")
-
-                if reason in (
-                    "ImagePullBackOff",
-                    "ErrImagePull", 
-                    "CrashLoopBackOff"
-                ):
-                    return(
-                        f"{component_name} pod failure: {pod_name}"
-                        f"reason={reason} {message}"
-                    ).strip()
-
-        return None
\ No newline at end of file
+    def _close_smoke_conn(self) -> None:
+        if self._smoke_conn is not None:
+            self._smoke_conn.close()
+            self._smoke_conn = None
@@ -1,42 +1,208 @@
 from __future__ import annotations
 
+import os
+import random
+import select
+import subprocess
+import sys
+import tempfile
+import threading
 import time
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import IO, Callable, Mapping, Optional, Sequence
 
+from .kube import popen, terminate
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class WaitSpec:
     poll_seconds: float = 2.0
+    initial_poll_seconds: float = 0.1
+    status_interval: float = 0.5
+    watch_timeout_seconds: float = 600.0
+
+
+class WaitError(RuntimeError):
+    pass
 
 
 CheckFn = Callable[[], tuple[bool, str]]
 FailFastFn = Callable[[], Optional[str]]
+EventFn = Callable[[str], tuple[bool, str]]
+
+# Stages may wait concurrently; keep their lines from interleaving.
+_OUTPUT_LOCK = threading.Lock()
+
+
+def _write(text: str) -> None:
+    with _OUTPUT_LOCK:
+        sys.stdout.write(text)
+        sys.stdout.flush()
 
 
 class Waiter:
-    def __init__(self, spec: WaitSpec):
+    def __init__(self, spec: WaitSpec, inline: bool = True):
         self.spec = spec
+        # inline redraws one status line in place; otherwise each update gets its own line.
+        self.inline = inline
+        self._last_print = 0.0
+        self._last_msg: str | None = None
+        self._pending_msg: str | None = None
+        self._status_width = 0
 
     def wait(self, title: str, check: CheckFn, fail_fast: FailFastFn | None = None) -> None:
-        print(f"  → {title}...")
+        _write(f"  → {title}...\n")
+
+        deadline = time.monotonic() + self.spec.watch_timeout_seconds
+        attempt = 0
+        last_msg: str | None = None
 
         while True:
             if fail_fast is not None:
                 err = fail_fast()
                 if err:
-                    raise RuntimeError(err)
+                    raise WaitError(err)
 
             done, msg = check()
 
-            if msg:
-                print(f"     {msg}", end="\r")
-
             if done:
-                if msg:
-                    print(f"     {msg} (OK)            ")
-                else:
-                    print("     OK")
+                self._finish(msg)
                 return
 
-            time.sleep(self.spec.poll_seconds)
\ No newline at end of file
+            if msg:
+                self._status(msg)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                detail = f" ({msg})" if msg else ""
+                raise WaitError(f"Timed out waiting for: {title}{detail}")
+
+            # Probe fast right after a state change, then back off towards poll_seconds.
+            if msg != last_msg:
+                attempt = 0
+                last_msg = msg
+            time.sleep(min(self._backoff(attempt), remaining))
+            attempt += 1
+
+    def _flush_status(self) -> None:
+        if self._pending_msg is not None:
+            self._status(self._pending_msg)
+
+    def _flush_delay(self) -> float | None:
+        if self._pending_msg is None:
+            return None
+        return max(0.0, self._last_print + self.spec.status_interval - time.monotonic())
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.spec.poll_seconds, self.spec.initial_poll_seconds * 2 ** min(attempt, 16))
+        return delay + random.uniform(0, 0.1 * delay)
+
+    def _finish(self, msg: str) -> None:
+        line = f"     {msg} (OK)" if msg else "     OK"
+        _write(line.ljust(self._status_width) + "\n")
+        self._last_msg = None
+        self._pending_msg = None
+        self._status_width = 0
+
+    def _status(self, msg: str) -> None:
+        if msg == self._last_msg:
+            self._pending_msg = None
+            return
+        now = time.monotonic()
+        if now - self._last_print < self.spec.status_interval:
+            # Too soon to redraw; keep the latest message for _flush_status.
+            self._pending_msg = msg
+            return
+
+        self._pending_msg = None
+
+        line = f"     {msg}"
+        if self.inline:
+            # Pad to the widest line drawn so far so a shorter message fully covers it.
+            self._status_width = max(self._status_width, len(line))
+            _write(line.ljust(self._status_width) + "\r")
+        else:
+            _write(line + "\n")
+        self._last_print = now
+        self._last_msg = msg
+
+
+class WatchWaiter(Waiter):
+    def watch(
+            self,
+            title: str,
+            command: Sequence[str],
+            on_event: EventFn,
+            fail_fast: FailFastFn | None = None,
+            env: Mapping[str, str] | None = None,
+        ) -> None:
+        _write(f"  → {title}...\n")
+
+        deadline = time.monotonic() + self.spec.watch_timeout_seconds
+        next_fail_fast = 0.0
+        proc: subprocess.Popen[bytes] | None = None
+        stderr: IO[bytes] | None = None
+        last_error = ""
+        pending = b""
+
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    if stderr is not None:
+                        last_error = _last_line(stderr) or last_error
+                    detail = f" (kubectl: {last_error})" if last_error else ""
+                    raise WaitError(f"Timed out waiting for: {title}{detail}")
+
+                if fail_fast is not None and now >= next_fail_fast:
+                    err = fail_fast()
+                    if err:
+                        raise WaitError(err)
+                    next_fail_fast = now + self.spec.poll_seconds
+
+                if proc is None:
+                    # A file rather than a pipe, so kubectl never blocks on unread errors.
+                    stderr = tempfile.TemporaryFile()
+                    proc = popen(command, stdout=subprocess.PIPE, stderr=stderr, env=env)
+                    pending = b""
+
+                timeout = min(self.spec.poll_seconds, deadline - now)
+                flush_delay = self._flush_delay()
+                if flush_delay is not None:
+                    timeout = min(timeout, flush_delay)
+                readable, _, _ = select.select([proc.stdout], [], [], timeout)
+                if not readable:
+                    self._flush_status()
+                    continue
+
+                chunk = os.read(proc.stdout.fileno(), 65536) if proc.stdout else b""
+                if not chunk:
+                    # The watch ended (apiserver timeout, kubectl error); start a new one.
+                    terminate(proc)
+                    proc = None
+                    if stderr is not None:
+                        last_error = _last_line(stderr) or last_error
+                        stderr.close()
+                        stderr = None
+                    time.sleep(min(self.spec.poll_seconds, max(deadline - time.monotonic(), 0)))
+                    continue
+
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    done, msg = on_event(line.decode(errors="replace"))
+                    if done:
+                        self._finish(msg)
+                        return
+                    if msg:
+                        self._status(msg)
+        finally:
+            if proc is not None:
+                terminate(proc)
+            if stderr is not None:
+                stderr.close()
+
+
+def _last_line(stream: IO[bytes]) -> str:
+    stream.seek(0)
+    lines = stream.read().decode(errors="replace").strip().splitlines()
+    return lines[-1].strip() if lines else ""